@@ -1,9 +1,52 @@
+import hashlib
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 import pandas as pd
 import pdfplumber
 import re
 from pathlib import Path
 
+# PyMuPDF's C engine parses pages much faster than pdfminer, but it finds
+# tables and lays out text differently, so it is opt-in via BEAD_USE_PYMUPDF=1.
+# Needs PyMuPDF >= 1.24.3 (the release that added the "pymupdf" module name).
+USE_PYMUPDF = os.environ.get('BEAD_USE_PYMUPDF') == '1'
+
+if USE_PYMUPDF:
+    try:
+        import pymupdf
+    except ImportError as e:
+        raise ImportError("BEAD_USE_PYMUPDF=1 requires PyMuPDF >= 1.24.3 "
+                          "(pip install pymupdf)") from e
+
+# Bump whenever extraction or cleanup rules change so cached results from an
+# older extractor are not reused
+EXTRACTOR_VERSION = 1
+
+# Compiled once and shared by every cleanup pass
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Header cell values that mark a table's column-title row
+PARTNER_HEADER_WORDS = frozenset(['partner', 'partners', 'name', 'organization', 'entity'])
+DESCRIPTION_HEADER_WORDS = frozenset(['description', 'role', 'current', 'planned'])
+
+# Section and table headings to skip in the text fallback
+SECTION_HEADER_WORDS = ('table', 'section', 'partnerships', 'description of current')
+
+# Words that mark a line as an organization name, matched as substrings
+ORG_WORDS = ('association', 'department', 'commission', 'authority', 'council', 
+             'bureau', 'agency', 'corporation', 'university', 'college', 'institute',
+             'foundation', 'center', 'network', 'partnership', 'alliance', 'cooperative',
+             'company', 'group', 'board', 'office', 'system', 'district')
+
+# Acronyms in parentheses, e.g. "(NTIA)"
+ACRONYM_RE = re.compile(r'\([A-Z]{2,}\)')
+
+# PDFs shorter than this are parsed in-process rather than split across workers
+PARALLEL_MIN_PAGES = 20
+
 def extract_state_name(filename):
     """Extract state name from filename"""
     base_name = Path(filename).stem
@@ -46,74 +89,176 @@ def find_partner_indicators():
         ]
     }
 
-def extract_partners_from_pdf(pdf_path):
-    """Extract partners from all tables with 2+ columns"""
+def iter_pdfplumber_pages(pdf_path, page_numbers=None):
+    """Yield (page_num, tables, extract_text) for each page using pdfplumber
+    
+    tables is None for pages without a text layer.
+    """
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            # Scanned/image-only pages have no text layer, so neither
+            # table nor text extraction can find anything on them
+            if not page.chars:
+                yield page.page_number, None, None
+                continue
+            
+            # The default "lines" table strategy builds tables from ruling
+            # lines and cell borders, so skip edge detection on pages that
+            # have none; they cannot contain a table
+            if page.lines or page.rects or page.curves:
+                tables = page.extract_tables()
+            else:
+                tables = []
+            yield page.page_number, tables, page.extract_text
+
+def iter_pymupdf_pages(pdf_path, page_numbers=None):
+    """Yield (page_num, tables, extract_text) for each page using PyMuPDF
+    
+    tables is None for pages without a text layer.
+    """
+    with pymupdf.open(pdf_path) as doc:
+        for page_num in page_numbers or range(1, doc.page_count + 1):
+            page = doc[page_num - 1]
+            text_page = page.get_text()
+            if not text_page.strip():
+                yield page_num, None, None
+                continue
+            
+            # Table.extract() returns the same nested lists as pdfplumber
+            tables = [table.extract() for table in page.find_tables().tables]
+            yield page_num, tables, lambda text_page=text_page: text_page
+
+def count_pages(pdf_path):
+    """Return the number of pages in a PDF"""
+    if USE_PYMUPDF:
+        with pymupdf.open(pdf_path) as doc:
+            return doc.page_count
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+def extract_partners_from_pages(pdf_path, page_numbers=None):
+    """Extract partners from the given 1-based pages (all pages if None)
+    
+    Returns (partners, descriptions, skipped_pages).
+    """
+    partners = []
+    descriptions = []
+    skipped_pages = 0
+    
+    iter_pages = iter_pymupdf_pages if USE_PYMUPDF else iter_pdfplumber_pages
+    # Bound methods hoisted out of the per-row loop
+    add_partner = partners.append
+    add_description = descriptions.append
+    for page_num, tables, extract_text in iter_pages(pdf_path, page_numbers):
+        if tables is None:
+            skipped_pages += 1
+            continue
+        
+        page_found_data = False
+        
+        if tables:
+            print(f"Page {page_num}: Found {len(tables)} tables")
+            
+            for table_idx, tbl in enumerate(tables):
+                if not tbl or len(tbl) < 2:
+                    continue
+                
+                # Check if table has at least 2 columns
+                if len(tbl[0]) < 2:
+                    continue
+                
+                rows_added = 0
+                
+                # Process all rows, skipping obvious headers
+                for row_idx, row in enumerate(tbl):
+                    if not row or len(row) < 2:
+                        continue
+                    
+                    # Handle None values
+                    partner = str(row[0]).strip() if row[0] else ""
+                    description = str(row[1]).strip() if row[1] else ""
+                    
+                    # Skip if either is empty
+                    if not partner or not description:
+                        continue
+                    
+                    # Skip header-like rows
+                    if (partner.lower() in PARTNER_HEADER_WORDS or 
+                        description.lower() in DESCRIPTION_HEADER_WORDS):
+                        continue
+                    
+                    # More lenient validation
+                    if len(partner) >= 2 and len(description) >= 2:
+                        add_partner(partner)
+                        add_description(description)
+                        rows_added += 1
+                        page_found_data = True
+                
+                if rows_added > 0:
+                    print(f"  Table {table_idx + 1}: Added {rows_added} partners")
+        
+        # If no data found from tables, try text extraction
+        if not page_found_data:
+            text_page = extract_text() or ""
+            if text_page.strip():  # Only try if there's actual text
+                text_partners = extract_partners_from_text_structured(text_page)
+                if text_partners:
+                    for partner, description in text_partners:
+                        add_partner(partner)
+                        add_description(description)
+                    print(f"Page {page_num}: Added {len(text_partners)} partners from text")
+    
+    return partners, descriptions, skipped_pages
+
+def split_page_ranges(page_count, chunk_count):
+    """Split pages 1..page_count into up to chunk_count contiguous ranges"""
+    chunk_size = -(-page_count // chunk_count)  # ceiling division
+    return [list(range(start, min(start + chunk_size, page_count + 1)))
+            for start in range(1, page_count + 1, chunk_size)]
+
+def extract_partners_from_pdf(pdf_path, max_workers=1):
+    """Extract partners from all tables with 2+ columns
+    
+    Returns parallel (partners, descriptions) lists so the caller can build
+    the DataFrame column-wise. Long PDFs are split into page ranges that are
+    parsed in separate processes when max_workers > 1.
+    """
     state_name = extract_state_name(pdf_path)
     print(f"\nProcessing {state_name}...")
     
-    all_rows = []
+    partners = []
+    descriptions = []
+    skipped_pages = 0
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, start=1):
-                tables = page.extract_tables()
-                page_found_data = False
-                
-                if tables:
-                    print(f"Page {page_num}: Found {len(tables)} tables")
-                    
-                    for table_idx, tbl in enumerate(tables):
-                        if not tbl or len(tbl) < 2:
-                            continue
-                        
-                        # Check if table has at least 2 columns
-                        if len(tbl[0]) < 2:
-                            continue
-                        
-                        rows_added = 0
-                        
-                        # Process all rows, skipping obvious headers
-                        for row_idx, row in enumerate(tbl):
-                            if not row or len(row) < 2:
-                                continue
-                            
-                            # Handle None values
-                            partner = str(row[0]).strip() if row[0] else ""
-                            description = str(row[1]).strip() if row[1] else ""
-                            
-                            # Skip if either is empty
-                            if not partner or not description:
-                                continue
-                            
-                            # Skip header-like rows
-                            if (partner.lower() in ['partner', 'partners', 'name', 'organization', 'entity'] or 
-                                description.lower() in ['description', 'role', 'current', 'planned']):
-                                continue
-                            
-                            # More lenient validation
-                            if len(partner) >= 2 and len(description) >= 2:
-                                all_rows.append([partner, description])
-                                rows_added += 1
-                                page_found_data = True
-                        
-                        if rows_added > 0:
-                            print(f"  Table {table_idx + 1}: Added {rows_added} partners")
-                
-                # If no data found from tables, try text extraction
-                if not page_found_data:
-                    text_page = page.extract_text() or ""
-                    if text_page.strip():  # Only try if there's actual text
-                        text_partners = extract_partners_from_text_structured(text_page)
-                        if text_partners:
-                            all_rows.extend(text_partners)
-                            print(f"Page {page_num}: Added {len(text_partners)} partners from text")
+        page_count = count_pages(pdf_path) if max_workers > 1 else 0
+        
+        # Spawning workers only pays off on long documents
+        if page_count >= PARALLEL_MIN_PAGES:
+            # Keep each range to several pages; every worker re-opens the PDF
+            range_count = min(max_workers, page_count // (PARALLEL_MIN_PAGES // 2))
+            page_ranges = split_page_ranges(page_count, range_count)
+            with ProcessPoolExecutor(max_workers=len(page_ranges)) as executor:
+                results = list(executor.map(extract_partners_from_pages,
+                                            repeat(pdf_path), page_ranges))
+        else:
+            results = [extract_partners_from_pages(pdf_path)]
+        
+        # Ranges are contiguous and map() keeps their order, so rows stay
+        # in page order
+        for range_partners, range_descriptions, range_skipped in results:
+            partners.extend(range_partners)
+            descriptions.extend(range_descriptions)
+            skipped_pages += range_skipped
                 
     except Exception as e:
         print(f"Error processing {pdf_path}: {e}")
-        return []
+        return [], []
     
-    print(f"Total raw entries: {len(all_rows)}")
-    return all_rows
+    if skipped_pages:
+        print(f"Skipped {skipped_pages} pages without text")
+    print(f"Total raw entries: {len(partners)}")
+    return partners, descriptions
 
 def extract_partners_from_text_structured(text):
     """Extract partners from text when table extraction fails"""
@@ -123,6 +268,7 @@ def extract_partners_from_text_structured(text):
     # Look for partner-description pairs in text
     current_partner = None
     current_desc = []
+    current_desc_len = 0  # len(' '.join(current_desc)), kept incrementally
     
     for line in lines:
         line = line.strip()
@@ -130,7 +276,8 @@ def extract_partners_from_text_structured(text):
             continue
         
         # Skip section headers and table headers
-        if any(word in line.lower() for word in ['table', 'section', 'partnerships', 'description of current']):
+        line_lower = line.lower()
+        if any(word in line_lower for word in SECTION_HEADER_WORDS):
             continue
         
         # Check if this looks like an organization name
@@ -141,15 +288,20 @@ def extract_partners_from_text_structured(text):
             
             current_partner = line
             current_desc = []
+            current_desc_len = 0
             
         elif current_partner and len(line) > 20:  # Looks like description text
+            if current_desc:
+                current_desc_len += 1  # joining space
             current_desc.append(line)
+            current_desc_len += len(line)
             
             # Don't let descriptions get too long
-            if len(' '.join(current_desc)) > 500:
+            if current_desc_len > 500:
                 partners.append([current_partner, ' '.join(current_desc)])
                 current_partner = None
                 current_desc = []
+                current_desc_len = 0
     
     # Don't forget the last one
     if current_partner and current_desc:
@@ -195,25 +347,21 @@ def has_structured_text(text):
     org_count = sum(1 for indicator in org_indicators if indicator in text.lower())
     return org_count >= 3
 
+# Running headers/footers repeat on every page, so lines recur a lot
+@lru_cache(maxsize=1 << 16)
 def is_likely_organization_name(text):
     """Check if text looks like an organization name"""
     if len(text) < 5 or len(text) > 150:
         return False
     
-    # Organization indicators
-    org_words = ['association', 'department', 'commission', 'authority', 'council', 
-                 'bureau', 'agency', 'corporation', 'university', 'college', 'institute',
-                 'foundation', 'center', 'network', 'partnership', 'alliance', 'cooperative',
-                 'company', 'group', 'board', 'office', 'system', 'district']
-    
     text_lower = text.lower()
     
     # Check for organizational words
-    if any(word in text_lower for word in org_words):
+    if any(word in text_lower for word in ORG_WORDS):
         return True
     
     # Check for acronyms in parentheses
-    if re.search(r'\([A-Z]{2,}\)', text):
+    if ACRONYM_RE.search(text):
         return True
     
     # Check for title case pattern (but not all caps)
@@ -225,41 +373,110 @@ def is_likely_organization_name(text):
     
     return False
 
-def process_pdf(pdf_path, output_folder):
+def file_sha256(path):
+    """Return the hex sha256 digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def process_pdf(pdf_path, output_folder, page_workers=1):
     """Process a single PDF file"""
     state_name = extract_state_name(pdf_path)
+    output_file = os.path.join(output_folder, f"{state_name.replace(' ', '_')}_Partners.xlsx")
+    
+    # Results are cached by PDF content, extractor version and backend, so
+    # unchanged PDFs are not re-parsed by the same extractor
+    cache_folder = os.path.join(output_folder, '.cache')
+    backend = 'pymupdf' if USE_PYMUPDF else 'pdfplumber'
+    cache_key = f"{file_sha256(pdf_path)}-{EXTRACTOR_VERSION}-{backend}"
+    cache_file = os.path.join(cache_folder, f"{cache_key}.xlsx")
+    count_file = os.path.join(cache_folder, f"{cache_key}.count")
+    if os.path.exists(cache_file) and os.path.exists(count_file):
+        shutil.copyfile(cache_file, output_file)
+        with open(count_file) as f:
+            partner_count = int(f.read())
+        print(f"\n{state_name} unchanged, reused cached result: {output_file}")
+        return partner_count
     
     # Extract partners
-    partner_rows = extract_partners_from_pdf(pdf_path)
+    partners, descriptions = extract_partners_from_pdf(pdf_path, max_workers=page_workers)
     
-    if not partner_rows:
+    if not partners:
         print(f"No partners found in {state_name}")
         return None
     
     # Create DataFrame
-    df = pd.DataFrame(partner_rows, columns=["Partner", "Description"])
+    df = pd.DataFrame({"Partner": partners, "Description": descriptions})
     
-    # Clean up data like in Alabama script
-    df["Partner"] = df["Partner"].astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
-    df["Description"] = df["Description"].astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
+    # Clean up data like in Alabama script. Values are already stripped
+    # strings, so one whitespace collapse over both columns is enough.
+    df = df.replace(WHITESPACE_RE, " ", regex=True)
     
-    # Remove duplicates
-    df = df.drop_duplicates(subset=['Partner'])
+    # Remove duplicate partners (first one wins) with a set over the cleaned
+    # column rather than a DataFrame-wide drop_duplicates pass
+    seen_partners = set()
+    keep = [partner not in seen_partners and not seen_partners.add(partner)
+            for partner in df["Partner"]]
+    df = df[keep]
     
     print(f"Extracted {len(df)} partners from {state_name}")
     
     # Save to Excel
-    output_file = os.path.join(output_folder, f"{state_name.replace(' ', '_')}_Partners.xlsx")
-    df.to_excel(output_file, index=False, sheet_name='Partners')
+    # Stream rows to disk instead of holding the whole sheet in memory.
+    # constant_memory only accepts row-by-row writes and df.to_excel writes
+    # column by column, so the rows are written directly.
+    with pd.ExcelWriter(output_file, engine='xlsxwriter',
+                        engine_kwargs={'options': {'constant_memory': True}}) as writer:
+        worksheet = writer.book.add_worksheet('Partners')
+        # Same header style df.to_excel applies
+        header_format = writer.book.add_format({'bold': True, 'border': 1,
+                                                'align': 'center', 'valign': 'top'})
+        worksheet.write_row(0, 0, df.columns, header_format)
+        for row_idx, row in enumerate(df.itertuples(index=False), start=1):
+            worksheet.write_row(row_idx, 0, row)
+    
+    Path(cache_folder).mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(output_file, cache_file)
+    with open(count_file, 'w') as f:
+        f.write(str(len(df)))
     
     print(f"Saved: {output_file}")
     return len(df)
 
+def process_pdf_file(pdf_file, input_folder, output_folder, page_workers=1):
+    """Process one PDF and return its summary row (runs in a worker process)"""
+    pdf_path = os.path.join(input_folder, pdf_file)
+    state_name = extract_state_name(pdf_file)
+    try:
+        partner_count = process_pdf(pdf_path, output_folder, page_workers)
+        
+        if partner_count:
+            return {
+                'State': state_name,
+                'Partners_Found': partner_count,
+                'Status': 'Success'
+            }
+        return {
+            'State': state_name,
+            'Partners_Found': 0,
+            'Status': 'No partners found'
+        }
+            
+    except Exception as e:
+        print(f"Error processing {pdf_file}: {e}")
+        return {
+            'State': state_name,
+            'Partners_Found': 'Error',
+            'Status': f'Error: {str(e)}'
+        }
+
 def main():
     input_folder = "pdf_files"
     output_folder = "extracted_partners"
     
-    # Create output folder
+    # Create output folder before any workers start writing to it
     Path(output_folder).mkdir(parents=True, exist_ok=True)
     
     # Find PDF files
@@ -271,39 +488,24 @@ def main():
     
     print(f"Found {len(pdf_files)} PDF files")
     
-    results = []
-    
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(input_folder, pdf_file)
-        try:
-            partner_count = process_pdf(pdf_path, output_folder)
-            state_name = extract_state_name(pdf_file)
-            
-            if partner_count:
-                results.append({
-                    'State': state_name,
-                    'Partners_Found': partner_count,
-                    'Status': 'Success'
-                })
-            else:
-                results.append({
-                    'State': state_name,
-                    'Partners_Found': 0,
-                    'Status': 'No partners found'
-                })
-                
-        except Exception as e:
-            print(f"Error processing {pdf_file}: {e}")
-            results.append({
-                'State': extract_state_name(pdf_file),
-                'Partners_Found': 'Error',
-                'Status': f'Error: {str(e)}'
-            })
+    if len(pdf_files) == 1:
+        # A single PDF gets no benefit from per-file workers, so split its
+        # pages across the cores instead
+        results = [process_pdf_file(pdf_files[0], input_folder, output_folder,
+                                    page_workers=os.cpu_count() or 1)]
+    else:
+        # Each PDF is independent, so spread them across all cores.
+        # Worker output may interleave; results keep the input order.
+        with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            results = list(executor.map(process_pdf_file, pdf_files,
+                                        repeat(input_folder), repeat(output_folder),
+                                        chunksize=1))
     
     # Create summary
     summary_df = pd.DataFrame(results)
     summary_file = os.path.join(output_folder, 'Processing_Summary.xlsx')
-    summary_df.to_excel(summary_file, index=False)
+    with pd.ExcelWriter(summary_file, engine='xlsxwriter') as writer:
+        summary_df.to_excel(writer, index=False)
     
     print(f"\n--- SUMMARY ---")
     print(f"Total files: {len(pdf_files)}")